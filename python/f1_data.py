@@ -5,19 +5,65 @@ This script provides functions to access Formula 1 data using the FastF1 library
 It is designed to be called from the Node.js MCP server.
 """
 
+import os
 import sys
 import json
+import math
+import time
+import functools
+import base64
 import traceback
+import weakref
+from collections import OrderedDict
 import fastf1
+import fastf1.ergast
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
 # Configure FastF1 cache
 fastf1.Cache.enable_cache('~/Documents/Cline/MCP/f1-mcp-server/cache')
 
+# Include Python tracebacks in error results only when F1_MCP_DEBUG=1
+DEBUG = os.environ.get('F1_MCP_DEBUG') == '1'
+
+# Ergast API client shared by all calls in this process
+_ergast = fastf1.ergast.Ergast()
+
+def _float_or_none(obj):
+    """Convert a float scalar to a Python float, mapping NaN and infinity to None"""
+    return float(obj) if math.isfinite(obj) else None
+
+def _isoformat(obj):
+    return obj.isoformat()
+
+# Converters keyed by exact scalar type, so common values skip the isinstance chain
+_JSON_SERIAL_DISPATCH = {
+    type(None): lambda obj: None,
+    type(pd.NaT): lambda obj: None,
+    str: str,
+    bool: bool,
+    np.bool_: bool,
+    int: int,
+    np.int64: int,
+    np.int32: int,
+    float: _float_or_none,
+    np.float64: _float_or_none,
+    np.float32: _float_or_none,
+    datetime: _isoformat,
+    pd.Timestamp: _isoformat,
+}
+
 def json_serial(obj):
     """Helper function to convert non-JSON serializable objects to strings"""
+    converter = _JSON_SERIAL_DISPATCH.get(type(obj))
+    if converter is not None:
+        return converter(obj)
     if isinstance(obj, (datetime, pd.Timestamp)):
         return obj.isoformat()
     if isinstance(obj, (np.integer, np.floating)):
@@ -26,283 +72,482 @@ def json_serial(obj):
         return None
     return str(obj)
 
+def _isoformat_series(series):
+    """Vectorized Timestamp.isoformat() for a datetime64 Series, keeping the UTC offset of
+    tz-aware values. NaT entries produce NaN and are left for the caller to mask."""
+    microseconds = series.dt.microsecond.fillna(0).astype('int64')
+    nanoseconds = series.dt.nanosecond.fillna(0).astype('int64')
+    
+    # isoformat() only adds fractional seconds when they are non-zero
+    fraction = pd.Series('', index=series.index)
+    has_micro = microseconds != 0
+    fraction[has_micro] = '.' + microseconds[has_micro].astype(str).str.zfill(6)
+    has_nano = nanoseconds != 0
+    fraction[has_nano] = '.' + (microseconds[has_nano] * 1000 + nanoseconds[has_nano]).astype(str).str.zfill(9)
+    
+    values = series.dt.strftime('%Y-%m-%dT%H:%M:%S') + fraction
+    if series.dt.tz is not None:
+        offset = series.dt.strftime('%z')
+        values = values + offset.str[:3] + ':' + offset.str[3:]
+    return values
+
+def _clean_column_values(series):
+    """Convert a Series to a list of JSON serializable values with a converter picked from its dtype.
+    Null entries are not handled here; callers mask them with Series.isna()."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return _isoformat_series(series).tolist()
+    if pd.api.types.is_timedelta64_dtype(series):
+        return series.astype(str).tolist()
+    if pd.api.types.is_numeric_dtype(series):
+        return series.tolist()
+    return [json_serial(v) for v in series.tolist()]
+
+def df_to_clean_records(df):
+    """Convert a DataFrame to a list of JSON serializable dicts, one column at a time"""
+    cols = df.columns.tolist()
+    nulls = df.isna().to_numpy()
+    columns = [_clean_column_values(df.iloc[:, i]) for i in range(len(cols))]
+    
+    return [
+        {col: None if null else value for col, value, null in zip(cols, row, row_nulls)}
+        for row, row_nulls in zip(zip(*columns), nulls)
+    ]
+
+def _clean_column(series):
+    """Convert a Series to a list of JSON serializable values with nulls as None"""
+    values = _clean_column_values(series)
+    nulls = series.isna().to_numpy()
+    if nulls.any():
+        values = [None if null else value for value, null in zip(values, nulls)]
+    return values
+
+def df_to_clean_columns(df):
+    """Convert a DataFrame to a dict mapping each column name to a list of JSON serializable values"""
+    return {col: _clean_column(df.iloc[:, i]) for i, col in enumerate(df.columns.tolist())}
+
+def _pack_array(values, dtype, **extra):
+    """Pack a numpy array as a base64 encoded little-endian typed array"""
+    data = np.ascontiguousarray(values, dtype=dtype)
+    return {
+        "dtype": data.dtype.name,
+        "data": base64.b64encode(data.tobytes()).decode('ascii'),
+        "n": len(data),
+        **extra
+    }
+
+# Telemetry channels whose range and resolution fit a small integer type when packed
+TELEMETRY_QUANTIZED_DTYPES = {
+    'Speed': '<i2',     # km/h
+    'RPM': '<i2',       # up to ~15000
+    'Throttle': '<u1',  # percent
+    'Brake': '<u1',     # on/off
+    'nGear': '<u1',
+    'DRS': '<u1'
+}
+
+def df_to_packed_columns(df, quantized_dtypes=None):
+    """Convert a DataFrame to a dict of columns where numeric and time columns are base64 encoded
+    typed arrays ({dtype, data, n}) and other columns are JSON lists.
+    Numeric columns are sent as float32 with NaN for missing values, or rounded to the integer
+    dtype given in quantized_dtypes when they have no missing values; datetime and timedelta
+    columns are sent as int64 nanoseconds with the int64 minimum for NaT."""
+    quantized_dtypes = quantized_dtypes or {}
+    columns = {}
+    for i, col in enumerate(df.columns.tolist()):
+        series = df.iloc[:, i]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            nanoseconds = np.asarray(series, dtype='datetime64[ns]').view(np.int64)
+            columns[col] = _pack_array(nanoseconds, '<i8', unit='ns', kind='datetime')
+        elif pd.api.types.is_timedelta64_dtype(series):
+            nanoseconds = np.asarray(series, dtype='timedelta64[ns]').view(np.int64)
+            columns[col] = _pack_array(nanoseconds, '<i8', unit='ns', kind='timedelta')
+        elif pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            dtype = quantized_dtypes.get(col)
+            if dtype is not None and not np.isnan(values).any():
+                limits = np.iinfo(dtype)
+                columns[col] = _pack_array(np.clip(np.rint(values), limits.min, limits.max), dtype)
+            else:
+                columns[col] = _pack_array(values, '<f4')
+        else:
+            columns[col] = _clean_column(series)
+    return columns
+
+def safe(func):
+    """Decorator returning an error result instead of raising when the wrapped function fails"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            return {"status": "error", "message": str(e), **({"traceback": traceback.format_exc()} if DEBUG else {})}
+    return wrapper
+
+# Loaded sessions kept in memory by the worker process, least recently used first
+SESSION_CACHE_SIZE = 8
+SESSION_CACHE_TTL = 30 * 60  # seconds
+_session_cache = OrderedDict()
+
+def _load_session(year, event_identifier, session_name, telemetry=True, weather=True, messages=True):
+    """Load a session, reusing a copy loaded by this process within the last SESSION_CACHE_TTL seconds.
+    A cached session that loaded more data than requested is reused as well."""
+    options = (telemetry, weather, messages)
+    now = time.monotonic()
+    
+    # Drop expired sessions so they are not kept alive next to their reloaded copies
+    for key in [key for key, (loaded_at, _) in _session_cache.items() if now - loaded_at >= SESSION_CACHE_TTL]:
+        del _session_cache[key]
+    
+    for key, (loaded_at, session) in _session_cache.items():
+        if (key[:3] == (year, event_identifier, session_name)
+                and all(loaded or not wanted for loaded, wanted in zip(key[3:], options))):
+            _session_cache.move_to_end(key)
+            return session
+    
+    session = fastf1.get_session(year, event_identifier, session_name)
+    session.load(telemetry=telemetry, weather=weather, messages=messages)
+    
+    key = (year, event_identifier, session_name) + options
+    _session_cache[key] = (now, session)
+    _session_cache.move_to_end(key)
+    while len(_session_cache) > SESSION_CACHE_SIZE:
+        _session_cache.popitem(last=False)
+    
+    return session
+
+# Row positions of each driver's laps in session.laps, built once per loaded session
+_driver_lap_positions_cache = weakref.WeakKeyDictionary()
+
+def _driver_lap_positions(session):
+    """Map each driver code to the positions of its laps in session.laps"""
+    positions = _driver_lap_positions_cache.get(session)
+    if positions is None:
+        positions = session.laps.groupby('Driver', sort=False).indices
+        _driver_lap_positions_cache[session] = positions
+    return positions
+
+def _resolve_driver_code(session, driver_identifier):
+    """Resolve a driver code or number to the driver code used in session.laps"""
+    driver = str(driver_identifier)
+    if driver in _driver_lap_positions(session):
+        return driver
+    try:
+        code = session.get_driver(driver)['Abbreviation']
+    except (KeyError, ValueError):
+        code = None
+    if not isinstance(code, str) or not code:
+        raise ValueError(f"Invalid driver identifier '{driver_identifier}'")
+    return code
+
+def _pick_driver_laps(session, driver_identifier):
+    """Get the laps of one driver, identified by code or number, without rescanning session.laps"""
+    positions = _driver_lap_positions(session)
+    driver = _resolve_driver_code(session, driver_identifier)
+    # Positional selection keeps the original lap index, which pick_fastest() relies on
+    return session.laps.iloc[positions.get(driver, [])]
+
+@safe
 def get_event_schedule(year):
     """Get the event schedule for a specified season"""
-    try:
-        year = int(year)
-        schedule = fastf1.get_event_schedule(year)
-        
-        # Convert DataFrame to JSON serializable format
-        result = []
-        for _, row in schedule.iterrows():
-            event_dict = row.to_dict()
-            # Clean and convert non-serializable values
-            clean_dict = {k: json_serial(v) for k, v in event_dict.items()}
-            result.append(clean_dict)
-        
-        return {"status": "success", "data": result}
-    except Exception as e:
-        return {"status": "error", "message": str(e), "traceback": traceback.format_exc()}
+    year = int(year)
+    schedule = fastf1.get_event_schedule(year)
+    
+    # Convert DataFrame to JSON serializable format
+    result = df_to_clean_records(schedule)
+    
+    return {"status": "success", "data": result}
 
+@safe
 def get_event_info(year, identifier):
     """Get information about a specific event"""
-    try:
-        year = int(year)
-        # Identifier can be event name or round number
-        if identifier.isdigit():
-            event = fastf1.get_event(year, int(identifier))
-        else:
-            event = fastf1.get_event(year, identifier)
-        
-        # Convert Series to dict and clean non-serializable values
-        event_dict = event.to_dict()
-        clean_dict = {k: json_serial(v) for k, v in event_dict.items()}
-        
-        return {"status": "success", "data": clean_dict}
-    except Exception as e:
-        return {"status": "error", "message": str(e), "traceback": traceback.format_exc()}
+    year = int(year)
+    # Identifier can be event name or round number
+    if identifier.isdigit():
+        event = fastf1.get_event(year, int(identifier))
+    else:
+        event = fastf1.get_event(year, identifier)
+    
+    # Convert Series to dict and clean non-serializable values
+    event_dict = event.to_dict()
+    clean_dict = {k: json_serial(v) for k, v in event_dict.items()}
+    
+    return {"status": "success", "data": clean_dict}
 
+@safe
 def get_session_results(year, event_identifier, session_name):
     """Get results for a specific session"""
-    try:
-        year = int(year)
-        session = fastf1.get_session(year, event_identifier, session_name)
-        session.load(telemetry=False)  # Load session without telemetry for faster results
-        
-        # Get results as a DataFrame
-        results = session.results
-        
-        # Convert results to JSON serializable format
-        result_list = []
-        for driver_num, result in results.items():
-            driver_result = result.to_dict()
-            # Clean and convert non-serializable values
-            clean_dict = {k: json_serial(v) for k, v in driver_result.items()}
-            result_list.append(clean_dict)
-        
-        return {"status": "success", "data": result_list}
-    except Exception as e:
-        return {"status": "error", "message": str(e), "traceback": traceback.format_exc()}
+    year = int(year)
+    session = _load_session(year, event_identifier, session_name, telemetry=False)  # Load session without telemetry for faster results
+    
+    # Get results as a DataFrame
+    results = session.results
+    
+    # Convert results to JSON serializable format
+    result_list = df_to_clean_records(results)
+    
+    return {"status": "success", "data": result_list}
 
+@safe
 def get_driver_info(year, event_identifier, session_name, driver_identifier):
     """Get information about a specific driver"""
-    try:
-        year = int(year)
-        session = fastf1.get_session(year, event_identifier, session_name)
-        session.load(telemetry=False)  # Load session without telemetry for faster results
-        
-        driver_info = session.get_driver(driver_identifier)
-        
-        # Convert to JSON serializable format
-        driver_dict = driver_info.to_dict()
-        clean_dict = {k: json_serial(v) for k, v in driver_dict.items()}
-        
-        return {"status": "success", "data": clean_dict}
-    except Exception as e:
-        return {"status": "error", "message": str(e), "traceback": traceback.format_exc()}
+    year = int(year)
+    session = _load_session(year, event_identifier, session_name, telemetry=False)  # Load session without telemetry for faster results
+    
+    driver_info = session.get_driver(driver_identifier)
+    
+    # Convert to JSON serializable format
+    driver_dict = driver_info.to_dict()
+    clean_dict = {k: json_serial(v) for k, v in driver_dict.items()}
+    
+    return {"status": "success", "data": clean_dict}
 
+@safe
 def analyze_driver_performance(year, event_identifier, session_name, driver_identifier):
     """Analyze a driver's performance in a session"""
-    try:
-        year = int(year)
-        session = fastf1.get_session(year, event_identifier, session_name)
-        session.load()
-        
-        # Get laps for the specified driver
-        driver_laps = session.laps.pick_driver(driver_identifier)
-        
-        # Basic statistics
-        fastest_lap = driver_laps.pick_fastest()
-        
-        # Calculate average lap time (excluding outliers)
-        valid_lap_times = []
-        for _, lap in driver_laps.iterrows():
-            if lap['LapTime'] is not None and not pd.isna(lap['LapTime']):
-                valid_lap_times.append(lap['LapTime'].total_seconds())
-        
-        avg_lap_time = sum(valid_lap_times) / len(valid_lap_times) if valid_lap_times else None
-        
-        # Format lap time as minutes:seconds.milliseconds
-        formatted_fastest = str(fastest_lap['LapTime']) if not pd.isna(fastest_lap['LapTime']) else None
-        
-        # Get all lap times
-        lap_times = []
-        for _, lap in driver_laps.iterrows():
-            lap_dict = {
-                "LapNumber": int(lap['LapNumber']) if not pd.isna(lap['LapNumber']) else None,
-                "LapTime": str(lap['LapTime']) if not pd.isna(lap['LapTime']) else None,
-                "Compound": lap['Compound'] if not pd.isna(lap['Compound']) else None,
-                "TyreLife": int(lap['TyreLife']) if not pd.isna(lap['TyreLife']) else None,
-                "Stint": int(lap['Stint']) if not pd.isna(lap['Stint']) else None,
-                "FreshTyre": bool(lap['FreshTyre']) if not pd.isna(lap['FreshTyre']) else None,
-                "LapStartTime": json_serial(lap['LapStartTime']) if not pd.isna(lap['LapStartTime']) else None
-            }
-            lap_times.append(lap_dict)
-        
-        # Format results
-        result = {
-            "DriverCode": fastest_lap['Driver'] if not pd.isna(fastest_lap['Driver']) else None,
-            "TotalLaps": len(driver_laps),
-            "FastestLap": formatted_fastest,
-            "AverageLapTime": avg_lap_time,
-            "LapTimes": lap_times
-        }
-        
-        return {"status": "success", "data": result}
-    except Exception as e:
-        return {"status": "error", "message": str(e), "traceback": traceback.format_exc()}
+    year = int(year)
+    # Skip telemetry and weather; race control messages are still needed so that laps
+    # deleted for track limits lose IsPersonalBest and are not reported as fastest
+    session = _load_session(year, event_identifier, session_name, telemetry=False, weather=False)
+    
+    # Get laps for the specified driver
+    driver_laps = _pick_driver_laps(session, driver_identifier)
+    
+    # Basic statistics
+    fastest_lap = driver_laps.pick_fastest()
+    
+    # Calculate average lap time (missing lap times are skipped by mean)
+    avg_lap_time = driver_laps['LapTime'].dt.total_seconds().mean()
+    avg_lap_time = None if pd.isna(avg_lap_time) else float(avg_lap_time)
+    
+    # Format lap time as minutes:seconds.milliseconds
+    formatted_fastest = str(fastest_lap['LapTime']) if not pd.isna(fastest_lap['LapTime']) else None
+    
+    # Get all lap times, using nullable dtypes so counters stay integers
+    lap_columns = ['LapNumber', 'LapTime', 'Compound', 'TyreLife', 'Stint', 'FreshTyre', 'LapStartTime']
+    lap_times = df_to_clean_records(driver_laps[lap_columns].astype({
+        'LapNumber': 'Int64',
+        'TyreLife': 'Int64',
+        'Stint': 'Int64',
+        'FreshTyre': 'boolean'
+    }))
+    
+    # Format results
+    result = {
+        "DriverCode": fastest_lap['Driver'] if not pd.isna(fastest_lap['Driver']) else None,
+        "TotalLaps": len(driver_laps),
+        "FastestLap": formatted_fastest,
+        "AverageLapTime": avg_lap_time,
+        "LapTimes": lap_times
+    }
+    
+    return {"status": "success", "data": result}
 
+@safe
 def compare_drivers(year, event_identifier, session_name, drivers):
     """Compare performance between multiple drivers"""
-    try:
-        year = int(year)
-        drivers_list = drivers.split(",")
-        
-        session = fastf1.get_session(year, event_identifier, session_name)
-        session.load()
-        
-        driver_comparisons = []
-        
-        for driver in drivers_list:
-            # Get laps and fastest lap for each driver
-            driver_laps = session.laps.pick_driver(driver)
-            fastest_lap = driver_laps.pick_fastest()
-            
-            # Calculate average lap time
-            valid_lap_times = []
-            for _, lap in driver_laps.iterrows():
-                if lap['LapTime'] is not None and not pd.isna(lap['LapTime']):
-                    valid_lap_times.append(lap['LapTime'].total_seconds())
-            
-            avg_lap_time = sum(valid_lap_times) / len(valid_lap_times) if valid_lap_times else None
-            
-            # Format lap time as string
-            formatted_fastest = str(fastest_lap['LapTime']) if not pd.isna(fastest_lap['LapTime']) else None
-            
-            # Compile driver data
-            driver_data = {
-                "DriverCode": driver,
-                "FastestLap": formatted_fastest,
-                "FastestLapNumber": int(fastest_lap['LapNumber']) if not pd.isna(fastest_lap['LapNumber']) else None,
-                "TotalLaps": len(driver_laps),
-                "AverageLapTime": avg_lap_time
-            }
-            
-            driver_comparisons.append(driver_data)
-        
-        return {"status": "success", "data": driver_comparisons}
-    except Exception as e:
-        return {"status": "error", "message": str(e), "traceback": traceback.format_exc()}
-
-def get_telemetry(year, event_identifier, session_name, driver_identifier, lap_number=None):
-    """Get telemetry data for a specific lap or fastest lap"""
-    try:
-        year = int(year)
-        session = fastf1.get_session(year, event_identifier, session_name)
-        session.load()
-        
-        # Get laps for the specified driver
-        driver_laps = session.laps.pick_driver(driver_identifier)
-        
-        # Get the specific lap or fastest lap
-        if lap_number:
-            lap = driver_laps[driver_laps['LapNumber'] == int(lap_number)].iloc[0]
-        else:
-            lap = driver_laps.pick_fastest()
-        
-        # Get telemetry data
-        telemetry = lap.get_telemetry()
-        
-        # Convert to JSON serializable format
-        telemetry_dict = telemetry.to_dict(orient='records')
-        clean_data = []
-        
-        for item in telemetry_dict:
-            clean_item = {k: json_serial(v) for k, v in item.items()}
-            clean_data.append(clean_item)
-        
-        # Add lap information
-        lap_info = {
-            "LapNumber": int(lap['LapNumber']) if not pd.isna(lap['LapNumber']) else None,
-            "LapTime": str(lap['LapTime']) if not pd.isna(lap['LapTime']) else None,
-            "Compound": lap['Compound'] if not pd.isna(lap['Compound']) else None,
-            "TyreLife": int(lap['TyreLife']) if not pd.isna(lap['TyreLife']) else None
-        }
-        
-        result = {
-            "lapInfo": lap_info,
-            "telemetry": clean_data
+    year = int(year)
+    drivers_list = [driver.strip() for driver in drivers.split(",")]
+    
+    # Skip telemetry and weather; race control messages are still needed so that laps
+    # deleted for track limits lose IsPersonalBest and are not reported as fastest
+    session = _load_session(year, event_identifier, session_name, telemetry=False, weather=False)
+    
+    # Aggregate lap statistics for all requested drivers in one groupby pass
+    positions = _driver_lap_positions(session)
+    driver_codes = [_resolve_driver_code(session, driver) for driver in drivers_list]
+    rows = [positions[code] for code in dict.fromkeys(driver_codes) if code in positions]
+    selected = session.laps.iloc[np.concatenate(rows) if rows else []]
+    lap_seconds = selected['LapTime'].dt.total_seconds()
+    
+    stats = selected.assign(_s=lap_seconds).groupby('Driver').agg(
+        avg=('_s', 'mean'),
+        n=('_s', 'size')
+    )
+    
+    # Fastest lap follows pick_fastest(): personal best laps only. NaNs are dropped
+    # first so drivers without a personal best lap do not break idxmin
+    personal_bests = lap_seconds.where(selected['IsPersonalBest'] == True).dropna()
+    fastest_idx_by_driver = personal_bests.groupby(selected.loc[personal_bests.index, 'Driver']).idxmin()
+    
+    # Rows are (Driver, avg, n)
+    stats_by_driver = {row[0]: row[1:] for row in stats.itertuples(name=None)}
+    
+    driver_comparisons = []
+    
+    for driver, code in zip(drivers_list, driver_codes):
+        avg_lap_time, lap_count = stats_by_driver.get(code, (None, 0))
+        fastest_idx = fastest_idx_by_driver.get(code)
+        
+        formatted_fastest = None
+        fastest_lap_number = None
+        if fastest_idx is not None:
+            fastest_lap = selected.loc[int(fastest_idx), ['LapTime', 'LapNumber']]
+            formatted_fastest = str(fastest_lap['LapTime'])
+            fastest_lap_number = int(fastest_lap['LapNumber']) if not pd.isna(fastest_lap['LapNumber']) else None
+        
+        # Compile driver data
+        driver_data = {
+            "DriverCode": driver,
+            "FastestLap": formatted_fastest,
+            "FastestLapNumber": fastest_lap_number,
+            "TotalLaps": int(lap_count),
+            "AverageLapTime": float(avg_lap_time) if avg_lap_time is not None and not pd.isna(avg_lap_time) else None
         }
         
-        return {"status": "success", "data": result}
-    except Exception as e:
-        return {"status": "error", "message": str(e), "traceback": traceback.format_exc()}
+        driver_comparisons.append(driver_data)
+    
+    return {"status": "success", "data": driver_comparisons}
 
+@safe
+def get_telemetry(year, event_identifier, session_name, driver_identifier, lap_number=None, output_format='json'):
+    """Get telemetry data for a specific lap or fastest lap.
+    output_format is 'json' for plain value lists or 'binary' for base64 encoded typed arrays."""
+    year = int(year)
+    if output_format not in ('json', 'binary'):
+        raise ValueError(f"Unknown telemetry format: {output_format}")
+    session = _load_session(year, event_identifier, session_name)
+    
+    # Get laps for the specified driver
+    driver_laps = _pick_driver_laps(session, driver_identifier)
+    
+    # Get the specific lap or fastest lap
+    if lap_number:
+        matching_laps = driver_laps[driver_laps['LapNumber'] == int(lap_number)]
+        if matching_laps.empty:
+            raise ValueError(f"Lap {lap_number} not found for driver {driver_identifier}")
+        lap = matching_laps.iloc[0]
+    else:
+        lap = driver_laps.pick_fastest()
+    
+    # Get telemetry data
+    telemetry = lap.get_telemetry()
+    
+    # Convert to JSON serializable format, one list or packed array per telemetry channel
+    if output_format == 'binary':
+        clean_data = df_to_packed_columns(telemetry, TELEMETRY_QUANTIZED_DTYPES)
+    else:
+        clean_data = df_to_clean_columns(telemetry)
+    
+    # Add lap information
+    lap_info = {
+        "LapNumber": int(lap['LapNumber']) if not pd.isna(lap['LapNumber']) else None,
+        "LapTime": str(lap['LapTime']) if not pd.isna(lap['LapTime']) else None,
+        "Compound": lap['Compound'] if not pd.isna(lap['Compound']) else None,
+        "TyreLife": int(lap['TyreLife']) if not pd.isna(lap['TyreLife']) else None
+    }
+    
+    result = {
+        "lapInfo": lap_info,
+        "telemetry": clean_data
+    }
+    
+    return {"status": "success", "data": result}
+
+@safe
 def get_championship_standings(year, round_num=None):
     """Get championship standings for drivers and constructors"""
-    try:
-        year = int(year)
-        
-        # Create Ergast API client
-        ergast = fastf1.ergast.Ergast()
-        
-        # Get Ergast API data
-        if round_num:
-            drivers_standings = ergast.get_driver_standings(season=year, round=round_num).content[0]
-            constructor_standings = ergast.get_constructor_standings(season=year, round=round_num).content[0]
-        else:
-            drivers_standings = ergast.get_driver_standings(season=year).content[0]
-            constructor_standings = ergast.get_constructor_standings(season=year).content[0]
-        
-        # Convert driver standings to JSON serializable format
-        drivers_list = []
-        for _, row in drivers_standings.iterrows():
-            driver_dict = row.to_dict()
-            clean_dict = {k: json_serial(v) for k, v in driver_dict.items()}
-            drivers_list.append(clean_dict)
-        
-        # Convert constructor standings to JSON serializable format
-        constructors_list = []
-        for _, row in constructor_standings.iterrows():
-            constructor_dict = row.to_dict()
-            clean_dict = {k: json_serial(v) for k, v in constructor_dict.items()}
-            constructors_list.append(clean_dict)
-        
-        return {
-            "status": "success",
-            "data": {
-                "drivers": drivers_list,
-                "constructors": constructors_list
-            }
+    year = int(year)
+    
+    # Get Ergast API data
+    if round_num:
+        drivers_standings = _ergast.get_driver_standings(season=year, round=round_num).content[0]
+        constructor_standings = _ergast.get_constructor_standings(season=year, round=round_num).content[0]
+    else:
+        drivers_standings = _ergast.get_driver_standings(season=year).content[0]
+        constructor_standings = _ergast.get_constructor_standings(season=year).content[0]
+    
+    # Convert driver standings to JSON serializable format
+    drivers_list = df_to_clean_records(drivers_standings)
+    
+    # Convert constructor standings to JSON serializable format
+    constructors_list = df_to_clean_records(constructor_standings)
+    
+    return {
+        "status": "success",
+        "data": {
+            "drivers": drivers_list,
+            "constructors": constructors_list
         }
-    except Exception as e:
-        return {"status": "error", "message": str(e), "traceback": traceback.format_exc()}
+    }
+
+def _non_finite_to_none(obj):
+    """Recursively replace NaN and infinite floats with None, as orjson does"""
+    if isinstance(obj, float):
+        return _float_or_none(obj)
+    if isinstance(obj, dict):
+        return {k: _non_finite_to_none(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_non_finite_to_none(v) for v in obj]
+    return obj
+
+def write_json(result):
+    """Write a result to stdout as a single line of JSON, using orjson when it is installed.
+    Both encoders produce the same output: non-finite floats become null."""
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(
+            result,
+            default=json_serial,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+        ))
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(_non_finite_to_none(result), default=json_serial, allow_nan=False), flush=True)
+
+FUNCTIONS = {
+    "get_event_schedule": get_event_schedule,
+    "get_event_info": get_event_info,
+    "get_session_results": get_session_results,
+    "get_driver_info": get_driver_info,
+    "analyze_driver_performance": analyze_driver_performance,
+    "compare_drivers": compare_drivers,
+    "get_telemetry": get_telemetry,
+    "get_championship_standings": get_championship_standings
+}
+
+def call_function(function_name, args):
+    """Call a function by name and return its result"""
+    if function_name not in FUNCTIONS:
+        return {"status": "error", "message": f"Unknown function: {function_name}"}
+    return FUNCTIONS[function_name](*args)
+
+def serve():
+    """Run as a persistent worker, answering newline-delimited JSON requests from stdin.
+    Each request is {"id": ..., "name": ..., "args": [...]} and each response is the
+    function result with the request id added."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = orjson.loads(line) if orjson is not None else json.loads(line)
+            request_id = request.get("id")
+            result = call_function(request["name"], request.get("args", []))
+        except Exception as e:
+            result = {"status": "error", "message": f"Invalid request: {e}"}
+        
+        # An unencodable result must not take down the worker and its cached sessions
+        try:
+            write_json(dict(result, id=request_id))
+        except Exception as e:
+            try:
+                write_json({"status": "error", "message": f"Failed to encode result: {e}", "id": request_id})
+            except Exception:
+                pass  # stdout is gone; keep reading until stdin closes
 
 def main():
     """Main function to parse arguments and call appropriate function"""
     if len(sys.argv) < 2:
-        print(json.dumps({"status": "error", "message": "No function specified"}))
+        write_json({"status": "error", "message": "No function specified"})
+        return
+    
+    if sys.argv[1] == "--worker":
+        serve()
         return
     
     function_name = sys.argv[1]
     args = sys.argv[2:] if len(sys.argv) > 2 else []
     
-    functions = {
-        "get_event_schedule": get_event_schedule,
-        "get_event_info": get_event_info,
-        "get_session_results": get_session_results,
-        "get_driver_info": get_driver_info,
-        "analyze_driver_performance": analyze_driver_performance,
-        "compare_drivers": compare_drivers,
-        "get_telemetry": get_telemetry,
-        "get_championship_standings": get_championship_standings
-    }
-    
-    if function_name in functions:
-        result = functions[function_name](*args)
-        print(json.dumps(result))
-    else:
-        print(json.dumps({"status": "error", "message": f"Unknown function: {function_name}"}))
+    write_json(call_function(function_name, args))
 
 if __name__ == "__main__":
     main()
@@ -7,7 +7,7 @@ import {
   ListToolsRequestSchema,
   McpError,
 } from '@modelcontextprotocol/sdk/types.js';
-import { spawn } from 'child_process';
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
 import path from 'path';
 import { fileURLToPath } from 'url';
 
@@ -17,40 +17,143 @@ const __dirname = path.dirname(fileURLToPath(import.meta.url));
 // Path to the Python script
 const pythonScriptPath = path.resolve(__dirname, '../python/f1_data.py');
 
+type PendingCall = {
+  resolve: (value: any) => void;
+  reject: (reason: Error) => void;
+};
+
 /**
- * Execute a Python function from the f1_data.py script
- * @param functionName - The function to call in the Python script
- * @param args - Arguments to pass to the function
- * @returns The result from the Python script
+ * Long-lived f1_data.py process. Keeping one worker alive avoids re-importing
+ * FastF1/pandas on every call and lets loaded sessions stay cached in memory.
  */
-async function executePythonFunction(functionName: string, args: string[] = []): Promise<any> {
-  return new Promise((resolve, reject) => {
+class PythonWorker {
+  private process: ChildProcessWithoutNullStreams | null = null;
+  private pending = new Map<number, PendingCall>();
+  private nextId = 1;
+  private buffer = '';
+  private stderr = '';
+  
+  /**
+   * Start the worker process if it is not already running
+   */
+  private ensureStarted(): ChildProcessWithoutNullStreams {
+    if (this.process) {
+      return this.process;
+    }
+    
     // Use 'python3' for macOS/Linux, 'python' for Windows
-    const pythonProcess = spawn('python3', [pythonScriptPath, functionName, ...args]);
+    const pythonProcess = spawn('python3', [pythonScriptPath, '--worker']);
+    this.buffer = '';
+    this.stderr = '';
     
-    let result = '';
-    let error = '';
+    // Decode as a stream so multi-byte UTF-8 characters split across chunks stay intact
+    pythonProcess.stdout.setEncoding('utf8');
+    pythonProcess.stderr.setEncoding('utf8');
     
-    pythonProcess.stdout.on('data', (data) => {
-      result += data.toString();
+    pythonProcess.stdout.on('data', (data: string) => {
+      this.buffer += data;
+      let newlineIndex;
+      while ((newlineIndex = this.buffer.indexOf('\n')) !== -1) {
+        const line = this.buffer.slice(0, newlineIndex);
+        this.buffer = this.buffer.slice(newlineIndex + 1);
+        if (line.trim()) {
+          this.handleLine(line);
+        }
+      }
     });
     
-    pythonProcess.stderr.on('data', (data) => {
-      error += data.toString();
+    pythonProcess.stderr.on('data', (data: string) => {
+      // Keep only the tail of stderr for error reporting
+      this.stderr = (this.stderr + data).slice(-4096);
     });
     
     pythonProcess.on('close', (code) => {
-      if (code !== 0) {
-        reject(new Error(`Python process exited with code ${code}: ${error}`));
-      } else {
-        try {
-          resolve(JSON.parse(result));
-        } catch (parseError) {
-          reject(new Error(`Failed to parse Python output: ${result}\n${parseError}`));
-        }
-      }
+      this.fail(pythonProcess, new Error(`Python process exited with code ${code}: ${this.stderr}`));
+    });
+    
+    // Spawn failures and EPIPE on writes to an exiting worker are emitted as 'error' events
+    pythonProcess.on('error', (error) => {
+      this.fail(pythonProcess, new Error(`Python process error: ${error.message}`));
+    });
+    
+    pythonProcess.stdin.on('error', (error) => {
+      this.fail(pythonProcess, new Error(`Failed to write to Python process: ${error.message}`));
+    });
+    
+    this.process = pythonProcess;
+    return pythonProcess;
+  }
+  
+  /**
+   * Reject all pending calls and drop the worker so the next call starts a new one
+   */
+  private fail(pythonProcess: ChildProcessWithoutNullStreams, error: Error) {
+    // Ignore late events from a worker that has already been replaced
+    if (this.process !== pythonProcess) {
+      return;
+    }
+    
+    for (const call of this.pending.values()) {
+      call.reject(error);
+    }
+    this.pending.clear();
+    this.process = null;
+    pythonProcess.kill();
+  }
+  
+  /**
+   * Resolve the pending call matching a response line
+   */
+  private handleLine(line: string) {
+    let response;
+    try {
+      response = JSON.parse(line);
+    } catch (parseError) {
+      console.error(`Failed to parse Python output: ${line}\n${parseError}`);
+      return;
+    }
+    
+    const { id, ...result } = response;
+    const call = this.pending.get(id);
+    if (call) {
+      this.pending.delete(id);
+      call.resolve(result);
+    } else {
+      console.error('Unexpected Python response:', line);
+    }
+  }
+  
+  /**
+   * Send a function call to the worker and wait for its result
+   */
+  call(functionName: string, args: string[]): Promise<any> {
+    const pythonProcess = this.ensureStarted();
+    const id = this.nextId++;
+    
+    return new Promise((resolve, reject) => {
+      this.pending.set(id, { resolve, reject });
+      pythonProcess.stdin.write(JSON.stringify({ id, name: functionName, args }) + '\n');
     });
-  });
+  }
+  
+  /**
+   * Stop the worker process
+   */
+  stop() {
+    this.process?.kill();
+  }
+}
+
+const pythonWorker = new PythonWorker();
+
+/**
+ * Execute a Python function from the f1_data.py script
+ * @param functionName - The function to call in the Python script
+ * @param args - Arguments to pass to the function
+ * @returns The result from the Python script
+ */
+async function executePythonFunction(functionName: string, args: string[] = []): Promise<any> {
+  return pythonWorker.call(functionName, args);
 }
 
 class FormulaOneServer {
@@ -76,6 +179,7 @@ class FormulaOneServer {
     // Error handling
     this.server.onerror = (error) => console.error('[MCP Error]', error);
     process.on('SIGINT', async () => {
+      pythonWorker.stop();
       await this.server.close();
       process.exit(0);
     });
@@ -222,7 +326,7 @@ class FormulaOneServer {
         },
         {
           name: 'get_telemetry',
-          description: 'Get telemetry data for a specific Formula One lap',
+          description: 'Get telemetry data for a specific Formula One lap, returned as one array per channel (e.g. Speed, RPM, Throttle)',
           inputSchema: {
             type: 'object',
             properties: {
@@ -246,6 +350,11 @@ class FormulaOneServer {
                 type: 'number',
                 description: 'Lap number (optional, gets fastest lap if not provided)',
               },
+              format: {
+                type: 'string',
+                enum: ['json', 'binary'],
+                description: 'Telemetry encoding (optional, defaults to "json"). "binary" returns numeric and time channels as base64 encoded typed arrays',
+              },
             },
             required: ['year', 'event_identifier', 'session_name', 'driver_identifier'],
           },
@@ -282,7 +391,7 @@ class FormulaOneServer {
       type DriverInfoArgs = { year: number; event_identifier: string; session_name: string; driver_identifier: string };
       type AnalyzeDriverArgs = { year: number; event_identifier: string; session_name: string; driver_identifier: string };
       type CompareDriversArgs = { year: number; event_identifier: string; session_name: string; drivers: string };
-      type TelemetryArgs = { year: number; event_identifier: string; session_name: string; driver_identifier: string; lap_number?: number };
+      type TelemetryArgs = { year: number; event_identifier: string; session_name: string; driver_identifier: string; lap_number?: number; format?: 'json' | 'binary' };
       type ChampionshipArgs = { year: number; round_num?: number };
       
       try {
@@ -356,8 +465,13 @@ class FormulaOneServer {
               typedArgs.driver_identifier.toString(),
             ];
             
-            if (typedArgs.lap_number !== undefined) {
-              telemetryArgs.push(typedArgs.lap_number.toString());
+            if (typedArgs.lap_number !== undefined || typedArgs.format !== undefined) {
+              // An empty lap number selects the fastest lap
+              telemetryArgs.push(typedArgs.lap_number !== undefined ? typedArgs.lap_number.toString() : '');
+            }
+            
+            if (typedArgs.format !== undefined) {
+              telemetryArgs.push(typedArgs.format);
             }
             
             result = await executePythonFunction('get_telemetry', telemetryArgs);